@@ -10,6 +10,7 @@ import difflib
 import json
 import os
 import subprocess
+import sys
 import tempfile
 import time
 import typing
@@ -30,6 +31,36 @@ from pygments import formatters, lexers
 from thrift.py3 import RpcOptions
 
 
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+
+    _loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, sort_keys=True).encode()
+
+    _loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+
+# How long `show` may serve the last fetched NodesConfig instead of fetching
+# it again. edit and apply always fetch a fresh one.
+NODES_CONFIG_CACHE_TTL = 5.0  # seconds
+
+# Larger configs are printed without syntax highlighting, pygments
+# tokenizes in pure Python and gets very slow on multi-megabyte documents.
+HIGHLIGHT_MAX_SIZE = 1024 * 1024  # bytes
+
+# Built once, they are costly to construct and are stateless between calls
+_JSON_LEXER = lexers.JsonLexer()
+_TERMINAL_FORMATTER = formatters.TerminalFormatter()
+
+
 class EditorError(Exception):
     pass
 
@@ -55,26 +86,84 @@ def _get_client():
     )
 
 
-def _get_nodes_config(client):
+def _fetch_nodes_config(client) -> typing.Dict[str, typing.Any]:
     ncm_bin = ncm.get_nodes_configuration(client)
     ncm_json_str = ncm.nodes_configuration_to_json(ncm_bin)
-    ncm_obj = json.loads(ncm_json_str)
-    return ncm_obj
+    return _loads(ncm_json_str)
+
+
+def _get_nodes_config(client) -> typing.Tuple[typing.Dict[str, typing.Any], bytes]:
+    """Returns the NodesConfig along with its canonical JSON serialization
+    (as produced by `_dumps`), so that callers don't have to re-serialize it.
+    """
+    ncm_obj = _fetch_nodes_config(client)
+    return ncm_obj, _dumps(ncm_obj)
+
+
+def _overwrite_nodes_config(client, nc_bin) -> None:
+    nubia.context.get_context().invalidate_nodes_config_cache()
+    ncm.overwrite_nodes_configuration(client, nc_bin)
+
+
+def _bump_version(nc, new_nc) -> None:
+    """Moves `new_nc` to the next version unless the user already set a new
+    version or timestamp explicitly.
+    """
+    if new_nc.get("version") in (None, nc["version"]):
+        new_nc["version"] = nc["version"] + 1
 
+    if new_nc.get("last_timestamp") in (None, nc["last_timestamp"]):
+        # time in ms
+        new_nc["last_timestamp"] = time.time_ns() // 1_000_000
 
-def _edit_text_with_editor(text: str) -> str:
-    with tempfile.NamedTemporaryFile(suffix=".json") as temp_file:
-        with open(temp_file.name, "w") as tmpf:
-            tmpf.write(text)
-            tmpf.flush()
+
+def _merge_patch(target, patch):
+    """Returns the result of applying a JSON merge patch (RFC 7386) to
+    `target`. Only the objects touched by the patch are copied, `target`
+    itself is left unmodified.
+    """
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = _merge_patch(result.get(key), value)
+    return result
+
+
+def _patch_changes(target, patch) -> bool:
+    """Returns whether applying the JSON merge patch `patch` would modify
+    `target`. Replaced values are compared through their serialization since
+    True == 1 and 1 == 1.0 in Python.
+    """
+    for key, value in patch.items():
+        if value is None:
+            if key in target:
+                return True
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            if _patch_changes(target[key], value):
+                return True
+        elif key not in target or _dumps(target[key]) != _dumps(value):
+            return True
+    return False
+
+
+def _edit_text_with_editor(text: bytes) -> bytes:
+    with tempfile.NamedTemporaryFile(suffix=".json", mode="w+b") as temp_file:
+        temp_file.write(text)
+        temp_file.flush()
 
         editor = os.environ.get("EDITOR", "nano")
-        pr = subprocess.Popen([editor, temp_file.name])
-        pr.wait()
-        if pr.returncode != 0:
+        try:
+            subprocess.run([editor, temp_file.name], check=True)
+        except subprocess.CalledProcessError:
             raise EditorError("Non-zero return code from editor")
 
-        with open(temp_file.name, "r") as tmpf:
+        # Editors may save by replacing the file rather than writing to it
+        # in place, so read it back by name instead of through temp_file.
+        with open(temp_file.name, "rb") as tmpf:
             new_text = tmpf.read()
 
     return new_text
@@ -90,20 +179,23 @@ class NodesConfig:
     async def show(self):
         """Print tier's NodesConfig to stdout"""
 
-        try:
-            client = _get_client()
-            nc = _get_nodes_config(client)
-        except Exception as e:
-            termcolor.cprint(str(e), "red")
-            return 1
-
-        print(
-            pygments.highlight(
-                json.dumps(nc, indent=4, sort_keys=True),
-                lexers.JsonLexer(),
-                formatters.TerminalFormatter(),
-            )
-        )
+        ctx = nubia.context.get_context()
+        cached = ctx.get_cached_nodes_config(NODES_CONFIG_CACHE_TTL)
+        if cached is None:
+            try:
+                client = _get_client()
+                cached = _get_nodes_config(client)
+            except Exception as e:
+                termcolor.cprint(str(e), "red")
+                return 1
+            ctx.set_cached_nodes_config(cached)
+
+        _, formatted = cached
+        nc_json = formatted.decode()
+        if sys.stdout.isatty() and len(formatted) < HIGHLIGHT_MAX_SIZE:
+            print(pygments.highlight(nc_json, _JSON_LEXER, _TERMINAL_FORMATTER))
+        else:
+            print(nc_json)
         return 0
 
     @nubia.command
@@ -114,12 +206,12 @@ class NodesConfig:
 
         try:
             client = _get_client()
-            nc = _get_nodes_config(client)
+            nc, formatted = _get_nodes_config(client)
         except Exception as e:
             termcolor.cprint(str(e), "red")
             return 1
 
-        formatted = json.dumps(nc, indent=4, sort_keys=True)
+        nc_list = formatted.decode().splitlines()
 
         edited_text = None
         while True:
@@ -127,37 +219,27 @@ class NodesConfig:
                 edited_text = _edit_text_with_editor(
                     formatted if edited_text is None else edited_text
                 )
-                edited_nc = json.loads(edited_text)
-                nc_list = json.dumps(nc, indent=4, sort_keys=True).split("\n")
-                edited_nc_list = json.dumps(edited_nc, indent=4, sort_keys=True).split(
-                    "\n"
-                )
-                diff = difflib.unified_diff(nc_list, edited_nc_list, lineterm="")
-
-                if next(diff, None) is None:
+                # Most editors append a trailing newline when saving
+                if edited_text.rstrip() == formatted:
                     raise EditorError("No changes detected")
 
-                if edited_nc.get("version", nc["version"]) == nc["version"]:
-                    edited_nc["version"] = nc["version"] + 1
+                edited_nc = _loads(edited_text)
 
-                if (
-                    edited_nc.get("last_timestamp", nc["last_timestamp"])
-                    == nc["last_timestamp"]
-                ):
-                    edited_nc["last_timestamp"] = int(time.time() * 1000)  # time in ms
+                # Compare serializations rather than objects: True == 1 and
+                # 1 == 1.0 in Python, but they are different configs.
+                if _dumps(edited_nc) == formatted:
+                    raise EditorError("No changes detected")
+
+                _bump_version(nc, edited_nc)
 
                 # It seems everything is fine, it's time to show final diff
-                edited_nc_json_str = json.dumps(edited_nc, indent=4, sort_keys=True)
-                edited_nc_list = edited_nc_json_str.split("\n")
+                edited_nc_json_str = _dumps(edited_nc).decode()
+                edited_nc_list = edited_nc_json_str.splitlines()
                 diff = difflib.unified_diff(nc_list, edited_nc_list, lineterm="")
                 termcolor.cprint("You're going to apply the following diff:", "red")
-                for line in diff:
-                    print(line)
+                sys.stdout.write("\n".join(diff) + "\n")
 
-                termcolor.cprint("\nWhat to do now?")
-                termcolor.cprint("[1] Apply")
-                termcolor.cprint("[2] Edit")
-                termcolor.cprint("[3] Cancel")
+                print("\nWhat to do now?\n[1] Apply\n[2] Edit\n[3] Cancel")
                 choice = ask_prompt("Choice:", options=("1", "2", "3"))
                 if choice == "2":
                     continue
@@ -172,12 +254,12 @@ class NodesConfig:
                     raise NCMError(f"Error on serializing config: {e}")
 
                 try:
-                    ncm.overwrite_nodes_configuration(client, nc_bin)
+                    _overwrite_nodes_config(client, nc_bin)
                     break
                 except Exception as e:
                     raise NCMError(f"Error on overwriting config: {e}")
 
-            except (EditorError, json.JSONDecodeError, NCMError) as e:
+            except (EditorError, _JSONDecodeError, NCMError) as e:
                 termcolor.cprint(str(e), "red")
                 if not confirm_prompt("Try again?"):
                     break
@@ -186,6 +268,55 @@ class NodesConfig:
 
         return 0
 
+    @nubia.command
+    @nubia.argument(
+        "patch",
+        description="Path to a JSON merge patch (RFC 7386) to apply to the "
+        "NodesConfig",
+    )
+    async def apply(self, patch: str):
+        """
+        Applies a JSON merge patch to the tier's NodesConfig without any
+        interactive step. Keys set to null in the patch are removed. Unless the
+        patch sets them, the version is bumped and last_timestamp is set to the
+        current time.
+        """
+
+        try:
+            with open(patch, "rb") as patch_file:
+                nc_patch = _loads(patch_file.read())
+        except (OSError, _JSONDecodeError) as e:
+            termcolor.cprint(str(e), "red")
+            return 1
+
+        if not isinstance(nc_patch, dict):
+            termcolor.cprint("The patch must be a JSON object", "red")
+            return 1
+
+        try:
+            client = _get_client()
+            nc = _fetch_nodes_config(client)
+        except Exception as e:
+            termcolor.cprint(str(e), "red")
+            return 1
+
+        if not _patch_changes(nc, nc_patch):
+            termcolor.cprint("No changes detected", "yellow")
+            return 0
+
+        new_nc = _merge_patch(nc, nc_patch)
+        _bump_version(nc, new_nc)
+
+        try:
+            nc_bin = ncm.json_to_nodes_configuration(_dumps(new_nc).decode())
+            _overwrite_nodes_config(client, nc_bin)
+        except Exception as e:
+            termcolor.cprint(str(e), "red")
+            return 1
+
+        termcolor.cprint("Successfully applied the patch", "green")
+        return 0
+
     @nubia.command
     # pyre-fixme[56]: Argument `textwrap.dedent("
     @nubia.argument(
@@ -237,6 +368,7 @@ class NodesConfig:
                 return 1
 
         ctx = nubia.context.get_context()
+        ctx.invalidate_nodes_config_cache()
         async with ctx.get_cluster_admin_client() as client:
             try:
                 await client.bootstrapCluster(
@@ -260,16 +392,18 @@ class NodesConfig:
         NONE) and dead.
         """
 
+        # Local aliases avoid a global lookup per node on large removals
+        nodes_filter, node_id = NodesFilter, NodeID
+        node_filters = [
+            nodes_filter(node=node_id(node_index=idx)) for idx in node_indexes
+        ]
+
         ctx = nubia.context.get_context()
+        ctx.invalidate_nodes_config_cache()
         async with ctx.get_cluster_admin_client() as client:
             try:
                 await client.removeNodes(
-                    request=RemoveNodesRequest(
-                        node_filters=[
-                            NodesFilter(node=NodeID(node_index=idx))
-                            for idx in node_indexes
-                        ]
-                    ),
+                    request=RemoveNodesRequest(node_filters=node_filters),
                     # pyre-fixme[28]: Unexpected keyword argument `timeout`.
                     rpc_options=RpcOptions(timeout=60),
                 )
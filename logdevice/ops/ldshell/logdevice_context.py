@@ -12,6 +12,7 @@ import logging
 import sys
 import tempfile
 import textwrap
+import time
 import typing
 
 from ldshell.helpers import create_socket_address
@@ -66,6 +67,7 @@ class LDShellContext(context.Context):
         self._temp_config_path = None
         self._ldquery = None
         self._client = None
+        self._nodes_config_cache = None
 
     def _set_arguments(self, args):
         self._loglevel = args.loglevel
@@ -256,6 +258,32 @@ class LDShellContext(context.Context):
     def get_cluster_name(self):
         return self._cluster_name
 
+    def get_cached_nodes_config(self, max_age: float):
+        """
+        Returns the NodesConfig stored by set_cached_nodes_config() if it was
+        stored less than max_age seconds ago, None otherwise.
+        """
+        if self._nodes_config_cache is None:
+            return None
+        stored_at, nodes_config = self._nodes_config_cache
+        if time.monotonic() - stored_at >= max_age:
+            return None
+        return nodes_config
+
+    def set_cached_nodes_config(self, nodes_config) -> None:
+        """
+        Caches a freshly fetched NodesConfig.
+        """
+        self._nodes_config_cache = (time.monotonic(), nodes_config)
+
+    def invalidate_nodes_config_cache(self) -> None:
+        """
+        Drops the cached NodesConfig. To be called before any command that
+        may change the NodesConfig: whatever the outcome, the cached one can't
+        be trusted anymore.
+        """
+        self._nodes_config_cache = None
+
     def get_prompt_tokens(self) -> typing.List[typing.Tuple[typing.Any, str]]:
         cluster = self.get_cluster_name()
 
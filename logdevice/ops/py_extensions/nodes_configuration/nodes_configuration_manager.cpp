@@ -58,7 +58,8 @@ static object get_nodes_configuration(Client& client) {
       handle<>(PyBytes_FromStringAndSize(nc_binary.c_str(), nc_binary.size())));
 }
 
-static std::string nodes_configuration_to_json(std::string binary_config) {
+static std::string
+nodes_configuration_to_json(const std::string& binary_config) {
   auto nc =
       ThriftCodec::deserialize<BinarySerializer, thrift::NodesConfiguration>(
           Slice::fromString(binary_config));
@@ -70,7 +71,7 @@ static std::string nodes_configuration_to_json(std::string binary_config) {
   return ThriftCodec::serialize<SimpleJSONSerializer>(*nc);
 }
 
-static object json_to_nodes_configuration(std::string json_config) {
+static object json_to_nodes_configuration(const std::string& json_config) {
   auto nc_thrift = ThriftCodec::deserialize<SimpleJSONSerializer,
                                             thrift::NodesConfiguration>(
       Slice::fromString(json_config));